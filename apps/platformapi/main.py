@@ -1,9 +1,14 @@
+import orjson
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.responses import HTMLResponse, RedirectResponse, Response
 from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
 from pathlib import Path
-import subprocess
+from dataclasses import dataclass, fields
+import asyncio
+import functools
 import re
+import shlex
 from typing import Dict, Optional
 import time
 import uuid
@@ -30,10 +35,28 @@ from apscheduler.triggers.interval import IntervalTrigger
 app = FastAPI(title="Platform API")
 
 BASE_DIR = Path(__file__).resolve().parent
-templates = Jinja2Templates(directory=str(BASE_DIR / "templates"))
+
+# Cache compiled template bytecode on disk so restarts skip re-parsing the
+# Jinja sources; auto_reload=False also drops the per-render mtime stat.
+_JINJA_CACHE_DIR = "/tmp/jinja_cache"
+os.makedirs(_JINJA_CACHE_DIR, exist_ok=True)
+_jinja_env = Environment(
+    loader=FileSystemLoader(str(BASE_DIR / "templates")),
+    autoescape=select_autoescape(),
+    bytecode_cache=FileSystemBytecodeCache(directory=_JINJA_CACHE_DIR),
+    auto_reload=False,
+)
+templates = Jinja2Templates(env=_jinja_env)
 
 INVENTORY_FILE = BASE_DIR / "ansible" / "inventory.yml"
 
+# Paths never change after import (they are baked into the image), so the
+# string forms and the inventory existence check are computed once here
+# instead of per run.
+_INVENTORY_PATH = str(INVENTORY_FILE)
+_INVENTORY_AVAILABLE = INVENTORY_FILE.is_file()
+_MAINFRAME_DIR = str(BASE_DIR / "ansible" / "mainframe")
+
 # Phase 1 UI: fixed set of allowed actions (no free-form command execution)
 GRAFANA_URL = "http://ac3183f05b9224744bea7533000a4006-1765183457.us-west-1.elb.amazonaws.com/login"  
 
@@ -70,6 +93,13 @@ ACTIONS: Dict[str, Dict[str, str]] = {
     },
 }
 
+# ACTIONS never changes after import, so the dashboard context entries can be
+# built once instead of on every /app request.
+ACTION_ITEMS = [
+    {"name": n, "label": m["label"], "description": m["description"]}
+    for n, m in ACTIONS.items()
+]
+
 RUNS: "deque[Dict]" = deque(maxlen=50)
 
 # ============================================================
@@ -149,66 +179,220 @@ async def prometheus_http_middleware(request: Request, call_next):
 # --------------------- UTILITIES ----------------------------
 # ============================================================
 
-def parse_play_recap(output: str):
-    summary = {}
-    if not output:
-        return summary
+# Compiled once at import so each run avoids the re-compile/cache-lookup cost.
+# Bytes patterns: ansible recap output is ASCII, so matching the raw stream
+# bytes skips a UTF-8 decode pass over the section before scanning it.
+_PLAY_RECAP_RE = re.compile(rb"PLAY RECAP \*+\n(.*?)(?:\n\n|\Z)", re.DOTALL)
+_RECAP_LINE_RE = re.compile(rb"^(\S+)\s*:\s*((?:\w+=[0-9]+\s*)+)$", re.MULTILINE)
+_KV_RE = re.compile(rb"(\w+)=([0-9]+)")
+
+
+@dataclass(frozen=True, slots=True)
+class RecapStats:
+    """Fixed-schema per-host recap record.
+
+    Slots keep each entry far smaller than a 7-key dict, and orjson
+    serializes dataclasses natively so the JSON shape is unchanged.
+    """
+
+    ok: int = 0
+    changed: int = 0
+    unreachable: int = 0
+    failed: int = 0
+    skipped: int = 0
+    rescued: int = 0
+    ignored: int = 0
+
+
+_RECAP_FIELDS = frozenset(f.name for f in fields(RecapStats))
 
-    m = re.search(r"PLAY RECAP \*+\n(.*?)(?:\n\n|\Z)", output, re.DOTALL)
+
+@functools.lru_cache(maxsize=256)
+def _parse_play_recap_cached(output: bytes) -> tuple:
+    """Tuple of (host, RecapStats) so lru_cache holds immutable values.
+
+    Scheduled runs against an unchanged inventory produce byte-identical
+    recap sections, so repeat parses become a cache hit.
+    """
+    m = _PLAY_RECAP_RE.search(output)
     if not m:
-        return summary
-
-    for line in m.group(1).strip().splitlines():
-        parts = line.split(":", 1)
-        if len(parts) != 2:
-            continue
-        host = parts[0].strip()
-        stats = {
-            kv.group(1): int(kv.group(2))
-            for kv in re.finditer(r"(\w+)=([0-9]+)", parts[1])
-        }
-        summary[host] = stats
+        return ()
+
+    # One multiline pass picks host and stat-tail together, replacing the
+    # old splitlines/strip/split loop over the recap body. Only the matched
+    # host and stat names get decoded, at dict-insert time.
+    return tuple(
+        (
+            line.group(1).decode("ascii", errors="replace"),
+            RecapStats(**{
+                k: v
+                for k, v in (
+                    (kv.group(1).decode("ascii"), int(kv.group(2)))
+                    for kv in _KV_RE.finditer(line.group(2))
+                )
+                if k in _RECAP_FIELDS
+            }),
+        )
+        for line in _RECAP_LINE_RE.finditer(m.group(1))
+    )
+
+
+def parse_play_recap(output: bytes):
+    if not output:
+        return {}
+    # RecapStats is frozen, so sharing cached instances across calls is safe.
+    return dict(_parse_play_recap_cached(output))
+
+
+def _summary_from_json(stdout: str) -> Optional[Dict]:
+    """Extract per-host stats from the json stdout callback's document.
+
+    Returns None when stdout is not the callback's JSON (ansible erroring
+    out before emitting the document, or an ansible version that rejects
+    the callback), so the caller can fall back to the PLAY RECAP parser.
+    """
+    try:
+        stats = orjson.loads(stdout)["stats"]
+    except (orjson.JSONDecodeError, KeyError, TypeError):
+        return None
+    if not isinstance(stats, dict):
+        return None
 
+    # ansible's stats use "failures" where the recap text says "failed";
+    # normalize into RecapStats so both paths yield one schema.
+    summary = {}
+    for host, host_stats in stats.items():
+        if not isinstance(host_stats, dict):
+            return None
+        mapped = {
+            ("failed" if k == "failures" else k): v
+            for k, v in host_stats.items()
+        }
+        summary[host] = RecapStats(
+            **{k: v for k, v in mapped.items() if k in _RECAP_FIELDS}
+        )
     return summary
 
 
-def _run_ansible_playbook(*, playbook: str, limit: Optional[str] = None) -> Dict:
-    if not INVENTORY_FILE.exists():
-        return {"success": False, "error": f"Inventory not found at {INVENTORY_FILE}"}
+async def _read_stdout(stream) -> tuple:
+    """Drain ansible stdout while the play is still running.
+
+    The PLAY RECAP section is collected as it streams past, so the recap
+    parse works on a few lines instead of re-scanning the full output, and
+    parsing overlaps with ansible execution. The recap stays as raw bytes
+    for the bytes-level regexes; only the full blob is decoded for the
+    run record.
+
+    Reads fixed-size blocks and splits lines manually instead of using the
+    stream's line iterator, which raises ValueError on any line longer
+    than the stream limit (debug-var lines and the json callback's
+    single-line documents can be arbitrarily large).
+    """
+    chunks = []
+    recap = []
+    in_recap = False
+    pending = b""
+    while True:
+        block = await stream.read(64 * 1024)
+        if not block:
+            break
+        chunks.append(block)
+        lines = (pending + block).split(b"\n")
+        pending = lines.pop()
+        for line in lines:
+            if not in_recap and line.startswith(b"PLAY RECAP"):
+                in_recap = True
+            if in_recap:
+                recap.append(line)
+    if pending:
+        if not in_recap and pending.startswith(b"PLAY RECAP"):
+            in_recap = True
+        if in_recap:
+            recap.append(pending)
+    return b"".join(chunks).decode(errors="replace"), b"\n".join(recap)
+
+
+# Static argv head shared by every action; only playbook/limit vary per run.
+# -f 25 matches the forks setting already used by the mainframe ansible.cfg.
+_CMD_PREFIX = ("ansible-playbook", "-i", _INVENTORY_PATH, "-f", "25")
+
+# SSH/execution tuning for every run: pipelining halves the SSH round-trips
+# per module, and ControlPersist reuses one connection across tasks instead
+# of re-handshaking. Playbooks already run with gather_facts disabled.
+_ANSIBLE_TUNING_ENV = {
+    "ANSIBLE_PIPELINING": "True",
+    "ANSIBLE_SSH_ARGS": (
+        "-C -o ControlMaster=auto -o ControlPersist=60s"
+        " -o ControlPath=/tmp/ansible-cp-%r@%h:%p"
+    ),
+    # Emit structured JSON on stdout so per-host stats come straight from
+    # ansible instead of a regex scan over the PLAY RECAP text.
+    "ANSIBLE_STDOUT_CALLBACK": "json",
+}
+
+
+@functools.lru_cache(maxsize=32)
+def _build_command(playbook: str, limit: Optional[str]) -> tuple:
+    """argv tuple plus display string for a run.
 
-    cmd = ["ansible-playbook", "-i", str(INVENTORY_FILE), playbook]
+    Every action's command is fully determined by (playbook, limit) and the
+    static inventory, so the list build and the joined echo string happen
+    once per action instead of on every run.
+    """
+    cmd = (*_CMD_PREFIX, playbook)
     if limit:
-        cmd.extend(["--limit", limit])
+        cmd += ("--limit", limit)
+    # shlex.join keeps the echoed command copy-pasteable even if a path
+    # ever contains shell metacharacters.
+    return cmd, shlex.join(cmd)
+
+
+async def _run_ansible_playbook(*, playbook: str, limit: Optional[str] = None) -> Dict:
+    if not _INVENTORY_AVAILABLE:
+        return {"success": False, "error": f"Inventory not found at {_INVENTORY_PATH}"}
+
+    cmd, cmd_display = _build_command(playbook, limit)
+
+    env = os.environ.copy()
+    env.update(_ANSIBLE_TUNING_ENV)
 
     # If the playbook lives under ansible/mainframe, tell Ansible to use that config.
     # We use the container path /app/ansible/mainframe/ansible.cfg as requested.
-    env = None
-    try:
-        pb_path = Path(playbook)
-        mainframe_dir = BASE_DIR / "ansible" / "mainframe"
-        # Use string containment to avoid resolve() failures on missing files
-        if str(mainframe_dir) in str(pb_path.parent):
-            env = os.environ.copy()
-            env["ANSIBLE_CONFIG"] = "/app/ansible/mainframe/ansible.cfg"
-    except Exception:
-        # If anything goes wrong detecting, continue without special env.
-        env = None
+    if playbook.startswith(_MAINFRAME_DIR):
+        env["ANSIBLE_CONFIG"] = "/app/ansible/mainframe/ansible.cfg"
 
     try:
-        proc = subprocess.run(cmd, capture_output=True, text=True, timeout=180, env=env)
-        return {
-            "success": proc.returncode == 0,
-            "returncode": proc.returncode,
-            "stdout": proc.stdout,
-            "stderr": proc.stderr,
-            "cmd": " ".join(cmd),
-            "play_summary": parse_play_recap(proc.stdout),
-        }
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=env,
+        )
     except FileNotFoundError:
         return {"success": False, "error": "ansible-playbook binary not found in PATH."}
-    except subprocess.TimeoutExpired:
+
+    async def _drain() -> tuple:
+        """Drain both pipes and reap the child under one timeout budget."""
+        streams = await asyncio.gather(_read_stdout(proc.stdout), proc.stderr.read())
+        await proc.wait()
+        return streams
+
+    try:
+        (stdout_text, recap_bytes), stderr = await asyncio.wait_for(_drain(), timeout=180)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
         return {"success": False, "error": "Ansible command timed out"}
 
+    return {
+        "success": proc.returncode == 0,
+        "returncode": proc.returncode,
+        "stdout": stdout_text,
+        "stderr": stderr.decode(errors="replace"),
+        "cmd": cmd_display,
+        "play_summary": _summary_from_json(stdout_text) or parse_play_recap(recap_bytes),
+    }
+
 
 
 
@@ -217,7 +401,7 @@ def _run_ansible_playbook(*, playbook: str, limit: Optional[str] = None) -> Dict
 # ------------------ ACTION EXECUTION ------------------------
 # ============================================================
 
-def execute_action(action: str, scheduled: bool = False):
+async def execute_action(action: str, scheduled: bool = False):
     meta = ACTIONS.get(action)
     if not meta:
         return None
@@ -227,7 +411,7 @@ def execute_action(action: str, scheduled: bool = False):
 
     IN_PROGRESS_RUNS.inc()
 
-    result = _run_ansible_playbook(
+    result = await _run_ansible_playbook(
         playbook=meta["playbook"],
         limit=meta.get("limit"),
     )
@@ -261,6 +445,11 @@ def execute_action(action: str, scheduled: bool = False):
     RUNS.appendleft(run_record)
     return run_record
 
+
+def execute_action_job(action: str, scheduled: bool = False):
+    """Sync wrapper so APScheduler's worker threads can run the async action."""
+    return asyncio.run(execute_action(action, scheduled))
+
 # ============================================================
 # --------------------- SCHEDULER ----------------------------
 # ============================================================
@@ -273,7 +462,7 @@ def start_scheduler():
 
     # Default: zos_ping every 10 minutes
     scheduler.add_job(
-        func=execute_action,
+        func=execute_action_job,
         trigger=IntervalTrigger(minutes=10),
         id="zos_ping_interval",
         replace_existing=True,
@@ -289,9 +478,17 @@ def shutdown_scheduler():
 # ------------------------ ROUTES ----------------------------
 # ============================================================
 
+# Resolved lazily on first request; the route table is fixed after startup,
+# so later requests skip the router walk that url_for does.
+_APP_HOME_PATH: Optional[str] = None
+
+
 @app.get("/")
 async def root(request: Request):
-    return RedirectResponse(url=request.url_for("app_home"), status_code=302)
+    global _APP_HOME_PATH
+    if _APP_HOME_PATH is None:
+        _APP_HOME_PATH = app.url_path_for("app_home")
+    return RedirectResponse(url=_APP_HOME_PATH, status_code=302)
 
 @app.get("/health")
 async def health():
@@ -304,21 +501,18 @@ async def metrics():
 @app.get("/app", name="app_home", response_class=HTMLResponse)
 async def app_home(request: Request):
     return templates.TemplateResponse(
+        request,
         "dashboard.html",
         {
-            "request": request,
             "title": "Platform API",
             "grafana_url": GRAFANA_URL,
-            "actions": [
-                {"name": n, "label": m["label"], "description": m["description"]}
-                for n, m in ACTIONS.items()
-            ],
+            "actions": ACTION_ITEMS,
         },
     )
 
 @app.post("/api/run/{action}")
 async def api_run_action(action: str):
-    result = execute_action(action, scheduled=False)
+    result = await execute_action(action, scheduled=False)
     if not result:
         raise HTTPException(status_code=404, detail="unknown action")
     return result
@@ -347,7 +541,7 @@ async def set_schedule(action: str, minutes: int):
     job_id = f"{action}_interval"
 
     scheduler.add_job(
-        func=execute_action,
+        func=execute_action_job,
         trigger=IntervalTrigger(minutes=minutes),
         id=job_id,
         replace_existing=True,